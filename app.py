@@ -1,54 +1,68 @@
-import math
-from typing import List
+from typing import Final
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 from calc import (
     monthly_loan_payment,
-    remaining_loan_balance,
+    remaining_balances,
     lease_payment_from_mf,
-    apr_to_money_factor,
 )
 
-# ---------- Helper: simple linear depreciation ----------
+# ---------- Static UI text ----------
 
+INTRO_MD: Final[str] = (
+    "This tool compares **leasing vs buying** a car over a chosen time horizon.\n\n"
+    "- In **Simple Mode**, you only need the numbers the dealer almost always gives you.\n"
+    "- In **Advanced Mode**, you can plug in (or estimate) the full lease structure.\n\n"
+    "This is an educational tool, not personalized financial advice."
+)
 
-def linear_depreciation_value(
-    initial_value: float,
-    end_value: float,
-    horizon_months: int,
-    month: int,
-) -> float:
-    """
-    Simple linear depreciation: value moves from initial_value at month 0
-    to end_value at month = horizon_months.
-    """
-    if horizon_months <= 0:
-        return end_value
-    month = max(0, month)
-    slope = (end_value - initial_value) / horizon_months
-    return initial_value + slope * min(month, horizon_months)
-
+HELP_MODE: Final[str] = (
+    "**Simple Mode**: just use your monthly lease payment and basic loan info.\n"
+    "**Advanced Mode**: enter (or estimate) money factor, residual, cap cost, etc."
+)
 
-# ---------- Validation utilities ----------
+HELP_TAX: Final[str] = "Approx combined state + local tax rate in your area for **buying**."
+
+DEALER_TIPS_MD: Final[str] = (
+    "- Ask for everything in **writing** (PDF or email quote).\n"
+    "- Clarify whether numbers shown are **before or after tax**.\n"
+    "- Confirm whether the quote assumes any **trade-in** or **rebate**.\n"
+    "- If something isn’t clear (like money factor or residual), "
+    "ask: _“Can you please show the money factor and residual used "
+    "to calculate this payment?”_\n"
+    "- Don’t be afraid to say you’re using a **calculator** to compare "
+    "lease vs buy – it shows you’re informed, not difficult."
+)
 
+# Typical resale value (% of purchase price) indexed by horizon in years
+_DEFAULT_RESIDUAL: Final[tuple] = (None, 80, 70, 60, 50, 45, 40, 35)
 
-def validate_positive(value, name):
-    if value < 0:
-        st.error(f"❌ {name} cannot be negative.")
-        st.stop()
+# ---------- Validation utilities ----------
 
 
-def validate_percentage(value, name):
-    if value < 0 or value > 100:
-        st.error(f"❌ {name} must be between 0% and 100%.")
-        st.stop()
+# Check kind -> (predicate that flags a bad value, error message template)
+_VALIDATION_RULES = {
+    "positive": (lambda v: v < 0, "{name} cannot be negative."),
+    "percentage": (lambda v: v < 0 or v > 100, "{name} must be between 0% and 100%."),
+    "nonzero": (lambda v: v == 0, "{name} cannot be zero."),
+}
 
 
-def validate_nonzero(value, name):
-    if value == 0:
-        st.error(f"❌ {name} cannot be zero.")
+def validate_inputs(checks):
+    """
+    Run every (value, name, kind) check and report all failures together,
+    stopping the app if any input is invalid.
+    """
+    errors = []
+    for value, name, kind in checks:
+        is_invalid, message = _VALIDATION_RULES[kind]
+        if is_invalid(value):
+            errors.append(f"❌ {message.format(name=name)}")
+    if errors:
+        st.error("\n\n".join(errors))
         st.stop()
 
 
@@ -72,6 +86,7 @@ def get_confidence_label(mode: str, using_estimates: bool) -> str:
 # ---------- Loan amortization helper ----------
 
 
+@st.cache_data(max_entries=32, show_spinner=False)
 def build_amortization_schedule(
     loan_amount: float,
     apr_percent: float,
@@ -79,33 +94,31 @@ def build_amortization_schedule(
     monthly_payment: float,
 ) -> pd.DataFrame:
     """Return a DataFrame with amortization details by month."""
-    rows = []
-    balance = loan_amount
+    n = max(term_months, 0)
     r = apr_percent / 100 / 12 if term_months > 0 else 0.0
 
-    for m in range(1, term_months + 1):
-        interest = balance * r if r > 0 else 0.0
-        principal = monthly_payment - interest
-        if principal < 0:
-            principal = 0.0
-        new_balance = max(0.0, balance - principal)
-        rows.append(
-            {
-                "Month": m,
-                "Payment": monthly_payment,
-                "Principal": principal,
-                "Interest": interest,
-                "Remaining balance": new_balance,
-            }
-        )
-        balance = new_balance
+    # Closed-form balance at the start and end of every month
+    balances = remaining_balances(
+        loan_amount, apr_percent, term_months, np.arange(n + 1), monthly_payment
+    )
+    interest = balances[:-1] * r
+    principal = np.maximum(0.0, monthly_payment - interest)
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame(
+        {
+            "Month": np.arange(1, n + 1),
+            "Payment": np.full(n, monthly_payment),
+            "Principal": principal,
+            "Interest": interest,
+            "Remaining balance": balances[1:],
+        }
+    )
 
 
 # ---------- Lease cashflow helper ----------
 
 
+@st.cache_data(max_entries=32, show_spinner=False)
 def build_lease_cashflows(
     lease_term_months: int,
     drive_off: float,
@@ -114,61 +127,218 @@ def build_lease_cashflows(
     disposition_fee: float,
 ) -> pd.DataFrame:
     """Return a DataFrame with lease cashflows over time."""
-    rows = []
-    cumulative = 0.0
+    n = max(lease_term_months, 0)
 
-    # Month 0 – drive-off
-    cumulative += drive_off
-    rows.append(
+    # Month 0 – drive-off, then monthly payments
+    step = ["Start"] + [f"Month {m}" for m in range(1, n + 1)]
+    types = ["Drive-off"] + ["Monthly payment"] * n
+    cash = [np.array([drive_off]), np.full(n, lease_monthly_with_tax)]
+
+    # End-of-lease charges
+    for label, amount in (
+        ("Mileage penalty", mileage_penalty),
+        ("Disposition fee", disposition_fee),
+    ):
+        if amount > 0:
+            step.append(f"End of lease – {label.lower()}")
+            types.append(label)
+            cash.append(np.array([amount]))
+
+    cash_flow = np.concatenate(cash)
+    month = np.arange(len(cash_flow))
+    month[n + 1 :] = n
+
+    return pd.DataFrame(
         {
-            "Step": "Start",
-            "Month": 0,
-            "Type": "Drive-off",
-            "Cash flow": drive_off,
-            "Cumulative": cumulative,
+            "Step": step,
+            "Month": month,
+            "Type": types,
+            "Cash flow": cash_flow,
+            "Cumulative": np.cumsum(cash_flow),
         }
     )
 
-    # Monthly payments
-    for m in range(1, lease_term_months + 1):
-        cf = lease_monthly_with_tax
-        cumulative += cf
-        rows.append(
-            {
-                "Step": f"Month {m}",
-                "Month": m,
-                "Type": "Monthly payment",
-                "Cash flow": cf,
-                "Cumulative": cumulative,
-            }
-        )
 
-    # End-of-lease charges
-    if mileage_penalty > 0:
-        cumulative += mileage_penalty
-        rows.append(
-            {
-                "Step": "End of lease – mileage penalty",
-                "Month": lease_term_months,
-                "Type": "Mileage penalty",
-                "Cash flow": mileage_penalty,
-                "Cumulative": cumulative,
-            }
-        )
+# ---------- Scenario computation ----------
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def compute_scenarios(
+    *,
+    purchase_price: float,
+    buy_fees: float,
+    tax_rate_global: float,
+    down_payment_buy: float,
+    loan_apr: float,
+    loan_term_months: int,
+    expected_value_pct: float,
+    horizon_months: int,
+    lease_monthly_with_tax: float,
+    lease_term_months: int,
+    drive_off: float,
+    disposition_fee: float,
+    allowed_miles_per_year: float,
+    expected_miles_per_year: float,
+    excess_mileage_fee: float,
+) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """
+    Run the buy and lease math for one set of inputs.
+
+    Returns the net-cost-over-time frame, the net cost at the horizon for the
+    bar chart, and a dict of summary figures. Cached so reruns that don't
+    touch these inputs skip the computation entirely.
+    """
+    tax_frac_global = tax_rate_global * 0.01
+    expected_value_frac = expected_value_pct * 0.01
+
+    # ---------- BUY CALCULATIONS ----------
+
+    taxable_amount = purchase_price + buy_fees
+    total_tax = taxable_amount * tax_frac_global
+    total_purchase_cost = taxable_amount + total_tax
+
+    loan_amount = max(total_purchase_cost - down_payment_buy, 0.0)
+    buy_monthly_payment = monthly_loan_payment(loan_amount, loan_apr, loan_term_months)
+
+    # Expected value at end of horizon
+    end_value_at_horizon = purchase_price * expected_value_frac
+
+    # ---------- LEASE CALCULATIONS ----------
+
+    # Excess miles per year × years in the lease × charge per mile
+    mileage_penalty = (
+        max(0.0, expected_miles_per_year - allowed_miles_per_year)
+        * (lease_term_months / 12)
+        * excess_mileage_fee
+    )
+
+    total_lease_payments_term = lease_monthly_with_tax * lease_term_months
+    net_cost_lease_full_term = (
+        drive_off + total_lease_payments_term + mileage_penalty + disposition_fee
+    )
 
-    if disposition_fee > 0:
-        cumulative += disposition_fee
-        rows.append(
-            {
-                "Step": "End of lease – disposition fee",
-                "Month": lease_term_months,
-                "Type": "Disposition fee",
-                "Cash flow": disposition_fee,
-                "Cumulative": cumulative,
-            }
+    # ---------- COST OVER TIME (FOR PLOTS) ----------
+
+    months = np.arange(1, horizon_months + 1)
+    months_paid = np.minimum(months, loan_term_months)
+
+    # Buying: net cost = down + payments + remaining balance − estimated car value
+    payments_made = buy_monthly_payment * months_paid
+    remaining_bal = remaining_balances(
+        loan_amount, loan_apr, loan_term_months, months, buy_monthly_payment
+    )
+    # Linear depreciation from purchase price (month 0) to end value (horizon)
+    value_m = np.linspace(purchase_price, end_value_at_horizon, horizon_months + 1)[1:]
+    buy_net_cost_by_month = down_payment_buy + payments_made + remaining_bal - value_m
+
+    # Leasing: cumulative cash out, flat at full lease net cost after it ends
+    lease_net_cost_by_month = np.where(
+        months <= lease_term_months,
+        drive_off + lease_monthly_with_tax * months,
+        net_cost_lease_full_term,
+    )
+    # End-of-lease charges land in the final lease month, if it is in range
+    if 0 < lease_term_months <= horizon_months:
+        lease_net_cost_by_month[lease_term_months - 1] += (
+            mileage_penalty + disposition_fee
         )
 
-    return pd.DataFrame(rows)
+    # Net cost at chosen horizon (last month)
+    net_cost_buy = float(buy_net_cost_by_month[-1])
+    net_cost_lease_at_horizon = float(lease_net_cost_by_month[-1])
+
+    # Charts don't need float64; summary figures above stay full precision
+    df_time = pd.DataFrame(
+        np.column_stack([buy_net_cost_by_month, lease_net_cost_by_month]).astype(
+            np.float32, copy=False
+        ),
+        index=pd.RangeIndex(1, horizon_months + 1, name="Month"),
+        columns=["Buy (net cost)", "Lease (net cost)"],
+    )
+
+    # Bar chart values are just the last row of the time series
+    df_bar = (
+        df_time.iloc[-1]
+        .rename("Net cost")
+        .rename({"Buy (net cost)": "Buy", "Lease (net cost)": "Lease"})
+        .rename_axis("Option")
+        .to_frame()
+    )
+
+    # ---------- Derived metrics: per year & per mile ----------
+
+    years = horizon_months / 12
+    total_miles_horizon = expected_miles_per_year * years
+
+    summary = {
+        "total_purchase_cost": total_purchase_cost,
+        "loan_amount": loan_amount,
+        "buy_monthly_payment": buy_monthly_payment,
+        "end_value_at_horizon": end_value_at_horizon,
+        "mileage_penalty": mileage_penalty,
+        "total_lease_payments_term": total_lease_payments_term,
+        "net_cost_lease_full_term": net_cost_lease_full_term,
+        "net_cost_buy": net_cost_buy,
+        "net_cost_lease_at_horizon": net_cost_lease_at_horizon,
+        "buy_cost_per_year": net_cost_buy / years if years > 0 else None,
+        "lease_cost_per_year": (
+            net_cost_lease_at_horizon / years if years > 0 else None
+        ),
+        "buy_cost_per_mile": (
+            net_cost_buy / total_miles_horizon if total_miles_horizon > 0 else None
+        ),
+        "lease_cost_per_mile": (
+            net_cost_lease_at_horizon / total_miles_horizon
+            if total_miles_horizon > 0
+            else None
+        ),
+    }
+
+    return df_time, df_bar, summary
+
+
+# ---------- Dealer checklist ----------
+
+
+@st.fragment
+def render_dealer_checklist():
+    """
+    Render the dealer checklist tabs. Runs as a fragment so ticking a
+    checkbox only reruns this block, not the whole comparison.
+    """
+    tab_buy, tab_lease, tab_tips = st.tabs(
+        ["Buying Quote Checklist", "Lease Quote Checklist", "General Tips"]
+    )
+
+    with tab_buy:
+        st.markdown("**Key items for a purchase quote:**")
+        st.checkbox("Final **out-the-door price** (including all fees & taxes)")
+        st.checkbox("Breakdown of **doc, title, registration, and other fees**")
+        st.checkbox("**Purchase price** of the car (before fees & tax)")
+        st.checkbox("**Rebates or incentives** applied")
+        st.checkbox("Loan **APR** and whether it’s promotional / conditional")
+        st.checkbox("Loan **term in months**")
+        st.checkbox("Any required **down payment**")
+        st.checkbox("Whether the loan has **prepayment penalties**")
+
+    with tab_lease:
+        st.markdown("**Key items for a lease quote:**")
+        st.checkbox("**MSRP** (sticker price)")
+        st.checkbox("**Cap cost / selling price** used for the lease")
+        st.checkbox("Any **cap cost reduction** (down payment, rebates applied)")
+        st.checkbox("Lease **term in months**")
+        st.checkbox("Monthly payment **before tax** and **with tax**")
+        st.checkbox("**Money factor (MF)** or equivalent APR")
+        st.checkbox("**Residual value %** (percentage of MSRP)")
+        st.checkbox("Total **drive-off / due at signing** amount")
+        st.checkbox("Annual **mileage allowance**")
+        st.checkbox("**Excess mileage charge** ($ per mile)")
+        st.checkbox("Lease **acquisition fee** (if any)")
+        st.checkbox("Lease **disposition / turn-in fee** at the end")
+
+    with tab_tips:
+        st.markdown("**General tips when talking to the dealer:**")
+        st.markdown(DEALER_TIPS_MD)
 
 
 # ---------- Streamlit App ----------
@@ -178,12 +348,7 @@ def main():
     st.set_page_config(page_title="Lease vs Buy Helper", layout="wide")
     st.title("Lease vs Buy Helper")
 
-    st.markdown(
-        "This tool compares **leasing vs buying** a car over a chosen time horizon.\n\n"
-        "- In **Simple Mode**, you only need the numbers the dealer almost always gives you.\n"
-        "- In **Advanced Mode**, you can plug in (or estimate) the full lease structure.\n\n"
-        "This is an educational tool, not personalized financial advice."
-    )
+    st.markdown(INTRO_MD)
 
     # ----- Sidebar: Global Settings -----
     st.sidebar.header("Mode")
@@ -192,10 +357,7 @@ def main():
         "Select Mode",
         ["Simple Mode", "Advanced Mode"],
         index=0,
-        help=(
-            "**Simple Mode**: just use your monthly lease payment and basic loan info.\n"
-            "**Advanced Mode**: enter (or estimate) money factor, residual, cap cost, etc."
-        ),
+        help=HELP_MODE,
     )
 
     horizon_years = st.sidebar.slider("Comparison Horizon (years)", 1, 7, 3)
@@ -207,7 +369,7 @@ def main():
         value=6.25,
         step=0.25,
         format="%.2f",
-        help="Approx combined state + local tax rate in your area for **buying**.",
+        help=HELP_TAX,
     )
 
     st.sidebar.markdown("---")
@@ -271,16 +433,11 @@ def main():
         )
 
         # Expected value slider with sensible defaults by horizon
-        default_residual_by_horizon = {
-            1: 80,
-            2: 70,
-            3: 60,
-            4: 50,
-            5: 45,
-            6: 40,
-            7: 35,
-        }
-        default_pct = default_residual_by_horizon.get(horizon_years, 50)
+        default_pct = (
+            _DEFAULT_RESIDUAL[horizon_years]
+            if horizon_years < len(_DEFAULT_RESIDUAL)
+            else 50
+        )
 
         expected_value_pct = st.slider(
             f"Estimated Value at End of {horizon_years} Years "
@@ -368,6 +525,9 @@ def main():
                 help="Many states tax each lease payment rather than the full price.",
             )
 
+            residual_frac = residual_pct * 0.01
+            lease_tax_frac = lease_tax_rate * 0.01
+
             drive_off = st.number_input(
                 "Drive-off Amount (cash due at signing) ($)",
                 min_value=0.0,
@@ -422,13 +582,11 @@ def main():
                 if known_payment_with_tax > 0 and msrp > 0 and cap_cost > 0:
                     # Convert to pre-tax payment (if tax is nonzero)
                     if lease_tax_rate > 0:
-                        payment_pre_tax = known_payment_with_tax / (
-                            1 + lease_tax_rate / 100
-                        )
+                        payment_pre_tax = known_payment_with_tax / (1 + lease_tax_frac)
                     else:
                         payment_pre_tax = known_payment_with_tax
 
-                    residual_value_tmp = msrp * (residual_pct / 100)
+                    residual_value_tmp = msrp * residual_frac
                     denom = cap_cost + residual_value_tmp
                     dep_fee = (cap_cost - residual_value_tmp) / lease_term_months
 
@@ -481,7 +639,9 @@ def main():
             )
 
             lease_tax_rate = 0.0  # already baked into the payment
+            lease_tax_frac = 0.0
             residual_pct = None
+            residual_frac = None
             money_factor = None
             msrp = None
             cap_cost = None
@@ -530,157 +690,80 @@ def main():
         "Tick items off as you collect them."
     )
 
-    tab_buy, tab_lease, tab_tips = st.tabs(
-        ["Buying Quote Checklist", "Lease Quote Checklist", "General Tips"]
-    )
-
-    with tab_buy:
-        st.markdown("**Key items for a purchase quote:**")
-        st.checkbox("Final **out-the-door price** (including all fees & taxes)")
-        st.checkbox("Breakdown of **doc, title, registration, and other fees**")
-        st.checkbox("**Purchase price** of the car (before fees & tax)")
-        st.checkbox("**Rebates or incentives** applied")
-        st.checkbox("Loan **APR** and whether it’s promotional / conditional")
-        st.checkbox("Loan **term in months**")
-        st.checkbox("Any required **down payment**")
-        st.checkbox("Whether the loan has **prepayment penalties**")
-
-    with tab_lease:
-        st.markdown("**Key items for a lease quote:**")
-        st.checkbox("**MSRP** (sticker price)")
-        st.checkbox("**Cap cost / selling price** used for the lease")
-        st.checkbox("Any **cap cost reduction** (down payment, rebates applied)")
-        st.checkbox("Lease **term in months**")
-        st.checkbox("Monthly payment **before tax** and **with tax**")
-        st.checkbox("**Money factor (MF)** or equivalent APR")
-        st.checkbox("**Residual value %** (percentage of MSRP)")
-        st.checkbox("Total **drive-off / due at signing** amount")
-        st.checkbox("Annual **mileage allowance**")
-        st.checkbox("**Excess mileage charge** ($ per mile)")
-        st.checkbox("Lease **acquisition fee** (if any)")
-        st.checkbox("Lease **disposition / turn-in fee** at the end")
-
-    with tab_tips:
-        st.markdown("**General tips when talking to the dealer:**")
-        st.markdown(
-            "- Ask for everything in **writing** (PDF or email quote).\n"
-            "- Clarify whether numbers shown are **before or after tax**.\n"
-            "- Confirm whether the quote assumes any **trade-in** or **rebate**.\n"
-            "- If something isn’t clear (like money factor or residual), "
-            "ask: _“Can you please show the money factor and residual used "
-            "to calculate this payment?”_\n"
-            "- Don’t be afraid to say you’re using a **calculator** to compare "
-            "lease vs buy – it shows you’re informed, not difficult."
-        )
+    render_dealer_checklist()
 
     st.markdown("---")
     st.header("📊 Results, Deal Analysis & Details")
 
     # ---------- VALIDATIONS ----------
 
-    validate_positive(purchase_price, "Purchase price")
-    validate_positive(down_payment_buy, "Down payment")
-    validate_positive(loan_apr, "Loan APR")
-    validate_nonzero(loan_term_months, "Loan term")
-    validate_percentage(expected_value_pct, "Estimated value %")
-
-    validate_positive(lease_term_months, "Lease term")
-    validate_positive(allowed_miles_per_year, "Mileage allowance")
-    validate_positive(excess_mileage_fee, "Excess mileage fee")
-    validate_positive(disposition_fee, "Disposition fee")
+    checks = [
+        (purchase_price, "Purchase price", "positive"),
+        (down_payment_buy, "Down payment", "positive"),
+        (loan_apr, "Loan APR", "positive"),
+        (loan_term_months, "Loan term", "nonzero"),
+        (expected_value_pct, "Estimated value %", "percentage"),
+        (lease_term_months, "Lease term", "positive"),
+        (allowed_miles_per_year, "Mileage allowance", "positive"),
+        (excess_mileage_fee, "Excess mileage fee", "positive"),
+        (disposition_fee, "Disposition fee", "positive"),
+    ]
 
     if is_advanced:
-        validate_positive(msrp, "MSRP")
-        validate_positive(cap_cost, "Cap cost")
-        validate_percentage(residual_pct, "Residual %")
-        validate_positive(money_factor, "Money factor")
+        checks += [
+            (msrp, "MSRP", "positive"),
+            (cap_cost, "Cap cost", "positive"),
+            (residual_pct, "Residual %", "percentage"),
+            (money_factor, "Money factor", "positive"),
+        ]
     else:
-        validate_positive(lease_monthly_with_tax, "Lease payment")
+        checks.append((lease_monthly_with_tax, "Lease payment", "positive"))
 
-    # ---------- BUY CALCULATIONS ----------
-
-    taxable_amount = purchase_price + buy_fees
-    total_tax = taxable_amount * (tax_rate_global / 100)
-    total_purchase_cost = taxable_amount + total_tax
+    validate_inputs(checks)
 
-    loan_amount = max(total_purchase_cost - down_payment_buy, 0.0)
-    buy_monthly_payment = monthly_loan_payment(loan_amount, loan_apr, loan_term_months)
-
-    # Expected value at end of horizon
-    end_value_at_horizon = purchase_price * (expected_value_pct / 100)
-
-    # ---------- LEASE CALCULATIONS ----------
+    # ---------- LEASE PAYMENT ----------
 
     if is_advanced:
-        residual_value = msrp * (residual_pct / 100)
+        residual_value = msrp * residual_frac
         base_lease_monthly = lease_payment_from_mf(
             cap_cost, residual_value, money_factor, lease_term_months
         )
-        lease_monthly_with_tax = base_lease_monthly * (1 + lease_tax_rate / 100)
+        lease_monthly_with_tax = base_lease_monthly * (1 + lease_tax_frac)
     # else: lease_monthly_with_tax already provided by user in simple mode
 
-    lease_years = lease_term_months / 12
-    total_allowed_miles = allowed_miles_per_year * lease_years
-    total_expected_miles_lease_term = expected_miles_per_year * lease_years
-    excess_miles = max(0.0, total_expected_miles_lease_term - total_allowed_miles)
-    mileage_penalty = excess_miles * excess_mileage_fee
-
-    total_lease_payments_term = lease_monthly_with_tax * lease_term_months
-    net_cost_lease_full_term = (
-        drive_off + total_lease_payments_term + mileage_penalty + disposition_fee
+    # ---------- BUY & LEASE CALCULATIONS ----------
+
+    df_time, df_bar, summary = compute_scenarios(
+        purchase_price=purchase_price,
+        buy_fees=buy_fees,
+        tax_rate_global=tax_rate_global,
+        down_payment_buy=down_payment_buy,
+        loan_apr=loan_apr,
+        loan_term_months=loan_term_months,
+        expected_value_pct=expected_value_pct,
+        horizon_months=horizon_months,
+        lease_monthly_with_tax=lease_monthly_with_tax,
+        lease_term_months=lease_term_months,
+        drive_off=drive_off,
+        disposition_fee=disposition_fee,
+        allowed_miles_per_year=allowed_miles_per_year,
+        expected_miles_per_year=expected_miles_per_year,
+        excess_mileage_fee=excess_mileage_fee,
     )
 
-    # ---------- COST OVER TIME (FOR PLOTS) ----------
-
-    months = list(range(1, horizon_months + 1))
-    buy_net_cost_by_month: List[float] = []
-    lease_net_cost_by_month: List[float] = []
-
-    for m in months:
-        # Buying: net cost = down + payments + remaining balance − estimated car value
-        payments_made = buy_monthly_payment * min(m, loan_term_months)
-        remaining_bal = remaining_loan_balance(
-            loan_amount, loan_apr, loan_term_months, m
-        )
-        value_m = linear_depreciation_value(
-            purchase_price, end_value_at_horizon, horizon_months, m
-        )
-        net_cost_buy_m = down_payment_buy + payments_made + remaining_bal - value_m
-        buy_net_cost_by_month.append(net_cost_buy_m)
-
-        # Leasing: cumulative cash out
-        if m <= lease_term_months:
-            lease_cost_m = drive_off + lease_monthly_with_tax * m
-            if m == lease_term_months:
-                lease_cost_m += mileage_penalty + disposition_fee
-        else:
-            # After lease ends, cost is flat at full lease net cost
-            lease_cost_m = net_cost_lease_full_term
-
-        lease_net_cost_by_month.append(lease_cost_m)
-
-    # Net cost at chosen horizon (last month)
-    net_cost_buy = buy_net_cost_by_month[-1]
-    net_cost_lease_at_horizon = lease_net_cost_by_month[-1]
-
-    # ---------- Derived metrics: per year & per mile ----------
-
-    years = horizon_years
-    total_miles_horizon = expected_miles_per_year * years
-
-    buy_cost_per_year = net_cost_buy / years if years > 0 else None
-    lease_cost_per_year = (
-        net_cost_lease_at_horizon / years if years > 0 else None
-    )
-
-    buy_cost_per_mile = (
-        net_cost_buy / total_miles_horizon if total_miles_horizon > 0 else None
-    )
-    lease_cost_per_mile = (
-        net_cost_lease_at_horizon / total_miles_horizon
-        if total_miles_horizon > 0
-        else None
-    )
+    total_purchase_cost = summary["total_purchase_cost"]
+    loan_amount = summary["loan_amount"]
+    buy_monthly_payment = summary["buy_monthly_payment"]
+    end_value_at_horizon = summary["end_value_at_horizon"]
+    mileage_penalty = summary["mileage_penalty"]
+    total_lease_payments_term = summary["total_lease_payments_term"]
+    net_cost_lease_full_term = summary["net_cost_lease_full_term"]
+    net_cost_buy = summary["net_cost_buy"]
+    net_cost_lease_at_horizon = summary["net_cost_lease_at_horizon"]
+    buy_cost_per_year = summary["buy_cost_per_year"]
+    lease_cost_per_year = summary["lease_cost_per_year"]
+    buy_cost_per_mile = summary["buy_cost_per_mile"]
+    lease_cost_per_mile = summary["lease_cost_per_mile"]
 
     # ---------- CONFIDENCE & RECOMMENDATION ----------
 
@@ -913,25 +996,10 @@ def main():
     with tab_details:
         st.subheader("📈 Net Cost Over Time")
 
-        df_time = pd.DataFrame(
-            {
-                "Month": months,
-                "Buy (net cost)": buy_net_cost_by_month,
-                "Lease (net cost)": lease_net_cost_by_month,
-            }
-        ).set_index("Month")
-
         st.line_chart(df_time)
 
         st.markdown("### 📊 Total Net Cost at Your Selected Horizon")
 
-        df_bar = pd.DataFrame(
-            {
-                "Option": ["Buy", "Lease"],
-                "Net cost": [net_cost_buy, net_cost_lease_at_horizon],
-            }
-        ).set_index("Option")
-
         st.bar_chart(df_bar)
 
         st.markdown("---")
@@ -949,7 +1017,7 @@ def main():
                 )
                 st.dataframe(df_amort, use_container_width=True)
                 st.markdown("**Remaining Balance Over Time**")
-                st.line_chart(df_amort.set_index("Month")[["Remaining balance"]])
+                st.line_chart(df_amort, x="Month", y="Remaining balance")
             else:
                 st.info(
                     "Enter a positive loan amount, APR, and term to see the schedule."
@@ -1,31 +1,108 @@
-def monthly_loan_payment(loan_amount: float, apr_percent: float, term_months: int) -> float:
+import math
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# Plain numbers that can take the pure-math fast paths
+_SCALAR_TYPES = (int, float, np.integer, np.floating)
+
+
+def monthly_loan_payment(loan_amount: ArrayLike, apr_percent: ArrayLike, term_months: ArrayLike) -> Union[float, np.ndarray]:
+    # Accepts scalars or broadcastable arrays; scalars come back as a scalar
+    if not isinstance(apr_percent, _SCALAR_TYPES):
+        apr_percent = np.asarray(apr_percent, dtype=np.float64)
+    return _payment_kernel(loan_amount, apr_percent / 100 / 12, term_months)
+
+
+def _payment_kernel(loan_amount: ArrayLike, r: ArrayLike, term_months: ArrayLike) -> Union[float, np.ndarray]:
+    # Same as monthly_loan_payment but takes the monthly rate directly, for
+    # callers that already hold it or sweep with the rate fixed
+    if (
+        isinstance(loan_amount, _SCALAR_TYPES)
+        and isinstance(r, _SCALAR_TYPES)
+        and isinstance(term_months, _SCALAR_TYPES)
+    ):
+        # Plain-float path so scalar callers skip the ndarray machinery
+        if term_months <= 0 or loan_amount <= 0:
+            return 0.0
+        if r == 0:
+            return loan_amount / term_months
+        return loan_amount * r / -math.expm1(-term_months * math.log1p(r))
+    loan_amount = np.asarray(loan_amount, dtype=np.float64)
+    term_months = np.asarray(term_months)
+    r = np.asarray(r, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Annuity denominator 1 - (1 + r)**-term, without cancellation at small r
+        denom = -np.expm1(-term_months * np.log1p(r))
+        payment = np.where(r == 0, loan_amount / term_months, loan_amount * r / denom)
+    return np.where((term_months <= 0) | (loan_amount <= 0), 0.0, payment)[()]
+
+
+def remaining_loan_balance(loan_amount: float, apr_percent: float, term_months: int, months_elapsed: ArrayLike) -> Union[float, np.ndarray]:
+    # A scalar month (or 0-d array) gives a float back; an array of months gives an array
+    if isinstance(months_elapsed, np.ndarray) and months_elapsed.ndim == 0:
+        months_elapsed = months_elapsed.item()
+    if not isinstance(months_elapsed, _SCALAR_TYPES):
+        return remaining_balances(loan_amount, apr_percent, term_months, months_elapsed)
+    # Scalar fast path: the same closed form with math, no array allocation
     if term_months <= 0 or loan_amount <= 0:
         return 0.0
     r = apr_percent / 100 / 12
+    payment = _payment_kernel(loan_amount, r, term_months)
+    k = min(max(months_elapsed, 0), term_months)
     if r == 0:
-        return loan_amount / term_months
-    return loan_amount * (r * (1 + r) ** term_months) / ((1 + r) ** term_months - 1)
+        return max(0.0, loan_amount - payment * k)
+    return max(0.0, loan_amount + math.expm1(k * math.log1p(r)) * (loan_amount - payment / r))
 
 
-def remaining_loan_balance(loan_amount: float, apr_percent: float, term_months: int, months_elapsed: int) -> float:
-    months_elapsed = max(0, min(months_elapsed, term_months))
+def remaining_balances(loan_amount: float, apr_percent: float, term_months: int, months_array: np.ndarray, payment: Optional[float] = None) -> np.ndarray:
+    months_array = np.asarray(months_array)
     if term_months <= 0 or loan_amount <= 0:
-        return 0.0
+        return np.zeros(months_array.shape)[()]
     r = apr_percent / 100 / 12
-    payment = monthly_loan_payment(loan_amount, apr_percent, term_months)
-    if r == 0:
-        return max(0.0, loan_amount - payment * months_elapsed)
-    factor = (1 + r) ** months_elapsed
-    balance = loan_amount * factor - payment * (factor - 1) / r
-    return max(0.0, balance)
+    if payment is None:
+        payment = _payment_kernel(loan_amount, r, term_months)
+    # Pick the kernel once so the array math never evaluates the unused branch
+    kernel = _remaining_balances_zero if r == 0 else _remaining_balances_amort
+    return kernel(loan_amount, r, payment, np.clip(months_array, 0, term_months))
 
 
-def lease_payment_from_mf(cap_cost: float, residual_value: float, money_factor: float, term_months: int) -> float:
-    if term_months <= 0 or cap_cost <= 0:
-        return 0.0
-    depreciation_fee = (cap_cost - residual_value) / term_months
+def _remaining_balances_zero(loan_amount: float, r: float, payment: float, k: np.ndarray) -> np.ndarray:
+    return np.maximum(0.0, loan_amount - payment * k)
+
+
+def _remaining_balances_amort(loan_amount: float, r: float, payment: float, k: np.ndarray) -> np.ndarray:
+    # f - 1 = (1 + r)**k - 1 via expm1/log1p to avoid cancellation at small r;
+    # loan * f - payment * (f - 1) / r then runs in place on that one buffer
+    # atleast_1d so a 0-d month still gives a writable buffer for the in-place ops
+    balance = np.atleast_1d(np.expm1(k * np.log1p(r)))
+    balance *= loan_amount - payment / r
+    balance += loan_amount
+    np.maximum(balance, 0.0, out=balance)
+    return balance.reshape(np.shape(k))[()]
+
+
+def lease_payment_from_mf(cap_cost: ArrayLike, residual_value: ArrayLike, money_factor: ArrayLike, term_months: ArrayLike) -> Union[float, np.ndarray]:
+    # Accepts scalars or broadcastable arrays; scalars come back as a float
+    if (
+        isinstance(cap_cost, _SCALAR_TYPES)
+        and isinstance(residual_value, _SCALAR_TYPES)
+        and isinstance(money_factor, _SCALAR_TYPES)
+        and isinstance(term_months, _SCALAR_TYPES)
+    ):
+        if term_months <= 0 or cap_cost <= 0:
+            return 0.0
+        return float((cap_cost - residual_value) / term_months + (cap_cost + residual_value) * money_factor)
+    cap_cost = np.asarray(cap_cost, dtype=np.float64)
+    residual_value = np.asarray(residual_value, dtype=np.float64)
+    money_factor = np.asarray(money_factor, dtype=np.float64)
+    term_months = np.asarray(term_months)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        depreciation_fee = (cap_cost - residual_value) / term_months
     finance_fee = (cap_cost + residual_value) * money_factor
-    return depreciation_fee + finance_fee
+    payment = depreciation_fee + finance_fee
+    return np.where((term_months <= 0) | (cap_cost <= 0), 0.0, payment)[()]
 
 
 def apr_to_money_factor(apr_percent: float) -> float:
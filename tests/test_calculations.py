@@ -1,18 +1,52 @@
+import numpy as np
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from hypothesis.extra import numpy as hnp
+
 from calc import (
     monthly_loan_payment,
     remaining_loan_balance,
+    remaining_balances,
     lease_payment_from_mf,
     apr_to_money_factor,
 )
 
 
-def test_monthly_loan_payment_zero_interest():
-    assert monthly_loan_payment(12000, 0, 12) == 1000
+@pytest.mark.parametrize(
+    "loan_amount, apr_percent, term_months, expected",
+    [
+        (12000, 0, 12, pytest.approx(1000)),
+        (20000, 5, 60, pytest.approx(377, abs=0.5)),
+    ],
+)
+def test_monthly_loan_payment(loan_amount, apr_percent, term_months, expected):
+    assert monthly_loan_payment(loan_amount, apr_percent, term_months) == expected
 
 
-def test_monthly_loan_payment_positive():
-    payment = monthly_loan_payment(20000, 5, 60)
-    assert round(payment, 0) == 377
+def _reference_payment(p, apr, n):
+    # Textbook annuity formula, the reference for the vectorized payment tests
+    r = apr / 1200
+    if n <= 0 or p <= 0:
+        return 0.0
+    return p / n if r == 0 else p * r / (1 - (1 + r) ** -n)
+
+
+@pytest.mark.parametrize(
+    "loan_amount, apr_percent, term_months",
+    [
+        (np.array([12000, 20000, 35000]), 5, 60),
+        (20000, np.array([0, 2.4, 5, 9.9]), 60),
+        (20000, 5, np.array([12, 36, 60, 84])),
+        (np.array([0, 20000, 20000]), 5, np.array([60, 0, 60])),
+    ],
+)
+def test_monthly_loan_payment_broadcasts(loan_amount, apr_percent, term_months):
+    payments = monthly_loan_payment(loan_amount, apr_percent, term_months)
+    shape = np.broadcast(loan_amount, apr_percent, term_months).shape
+    expected = np.vectorize(_reference_payment)(loan_amount, apr_percent, term_months)
+    assert payments.shape == shape
+    np.testing.assert_allclose(payments, expected)
 
 
 def test_remaining_loan_balance_reduces():
@@ -21,19 +55,177 @@ def test_remaining_loan_balance_reduces():
     assert bal_12mo < bal_start
 
 
+@pytest.mark.parametrize("apr_percent", [0, 2.4, 5, 12])
+def test_remaining_loan_balance_monotonic(apr_percent):
+    balances = [remaining_loan_balance(20000, apr_percent, 60, k) for k in range(61)]
+    assert balances[0] == pytest.approx(20000)
+    assert all(later < earlier for earlier, later in zip(balances, balances[1:]))
+    assert balances[-1] == pytest.approx(0.0, abs=1e-6)
+
+
 def test_remaining_loan_balance_zero_after_term():
     bal = remaining_loan_balance(20000, 5, 60, 60)
     assert round(bal, 2) == 0.0
 
 
+def test_remaining_loan_balance_accepts_month_array():
+    balances = remaining_loan_balance(20000, 5, 60, np.arange(61))
+    assert balances.shape == (61,)
+    assert balances[12] == pytest.approx(remaining_loan_balance(20000, 5, 60, 12))
+    assert balances[-1] == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.parametrize("apr_percent", [0, 5])
+def test_remaining_loan_balance_scalar_matches_array(apr_percent):
+    months = np.arange(-2, 75)
+    balances = remaining_balances(20000, apr_percent, 60, months)
+    for k, expected in zip(months, balances):
+        assert remaining_loan_balance(20000, apr_percent, 60, int(k)) == pytest.approx(expected, abs=1e-6)
+    zero_d = remaining_loan_balance(20000, apr_percent, 60, np.array(12))
+    assert isinstance(zero_d, float)
+    assert zero_d == pytest.approx(balances[14])
+
+
 def test_money_factor_conversion():
     assert apr_to_money_factor(2.4) == 0.001
 
 
-def test_lease_payment_formula():
-    cap_cost = 30000
-    residual = 18000
-    mf = 0.001
-    payment = lease_payment_from_mf(cap_cost, residual, mf, 36)
-    expected = (12000 / 36) + ((30000 + 18000) * 0.001)
-    assert round(payment, 2) == round(expected, 2)
+@pytest.mark.parametrize(
+    "cap_cost, residual, mf, term_months, expected",
+    [
+        (30000, 18000, 0.001, 36, 381.33),
+        (45000, 25000, 0.00125, 24, 920.83),
+        (36000, 22000, 0.0, 36, 388.89),
+    ],
+)
+def test_lease_payment_formula(cap_cost, residual, mf, term_months, expected):
+    payment = lease_payment_from_mf(cap_cost, residual, mf, term_months)
+    assert payment == pytest.approx(expected, abs=0.005)
+
+
+def test_remaining_balances_matches_amortization():
+    payment = monthly_loan_payment(20000, 5, 60)
+    balance = 20000.0
+    expected = [balance]
+    for _ in range(60):
+        balance = balance * (1 + 0.05 / 12) - payment
+        expected.append(max(0.0, balance))
+    balances = remaining_balances(20000, 5, 60, np.arange(0, 61))
+    np.testing.assert_allclose(balances, expected, atol=1e-6)
+
+
+def test_remaining_balances_zero_interest():
+    balances = remaining_balances(12000, 0, 12, np.array([0, 6, 12, 24]))
+    np.testing.assert_allclose(balances, [12000, 6000, 0, 0])
+
+
+@pytest.mark.parametrize("apr_percent", [0, 5])
+@pytest.mark.parametrize("month", [12, np.array(12)])
+def test_remaining_balances_scalar_month(apr_percent, month):
+    balance = remaining_balances(20000, apr_percent, 60, month)
+    assert np.ndim(balance) == 0
+    assert balance == pytest.approx(remaining_loan_balance(20000, apr_percent, 60, 12))
+
+
+def test_remaining_balances_uses_given_payment():
+    months = np.arange(0, 61)
+    payment = monthly_loan_payment(20000, 5, 60)
+    np.testing.assert_allclose(
+        remaining_balances(20000, 5, 60, months, payment),
+        remaining_balances(20000, 5, 60, months),
+    )
+    # A larger payment pays the loan off early
+    assert remaining_balances(20000, 5, 60, np.array([48]), payment * 1.5)[0] == 0.0
+
+
+def test_lease_payment_formula_broadcasts_over_residuals():
+    residuals = np.linspace(15000, 20000, 5)
+    payments = lease_payment_from_mf(30000, residuals, 0.001, 36)
+    assert payments.shape == (5,)
+    assert payments[0] == pytest.approx((15000 / 36) + (45000 * 0.001))
+    assert payments[-1] == pytest.approx((10000 / 36) + (50000 * 0.001))
+
+
+def test_lease_payment_broadcasts_over_money_factors():
+    payments = lease_payment_from_mf(30000, 18000, [0.001, 0.002], 36)
+    assert payments.shape == (2,)
+    assert payments[1] == pytest.approx(lease_payment_from_mf(30000, 18000, 0.002, 36))
+
+
+def test_lease_payment_scalar_returns_float():
+    assert isinstance(lease_payment_from_mf(30000, 18000, 0.001, 36), float)
+    assert isinstance(lease_payment_from_mf(30000, 18000, 0.001, 0), float)
+
+
+def test_lease_payment_zero_for_invalid_inputs():
+    assert lease_payment_from_mf(30000, 18000, 0.001, 0) == 0.0
+    payments = lease_payment_from_mf(np.array([0, 30000]), 18000, 0.001, 36)
+    assert payments[0] == 0.0
+    assert payments[1] > 0
+
+
+# Either interest-free or a realistic rate; subnormal APRs aren't meaningful inputs
+apr_values = st.one_of(st.just(0.0), st.floats(0.01, 25))
+
+
+@st.composite
+def loan_scenarios(draw):
+    size = draw(st.integers(1, 1024))
+    principals = draw(hnp.arrays(np.float64, size, elements=st.floats(1e3, 1e6)))
+    aprs = draw(hnp.arrays(np.float64, size, elements=apr_values))
+    terms = draw(hnp.arrays(np.int64, size, elements=st.integers(1, 96)))
+    return principals, aprs, terms
+
+
+@given(loan_scenarios())
+def test_monthly_loan_payment_matches_scalar_reference(scenarios):
+    principals, aprs, terms = scenarios
+    expected = np.vectorize(_reference_payment)(principals, aprs, terms)
+    np.testing.assert_allclose(
+        monthly_loan_payment(principals, aprs, terms), expected, rtol=1e-9
+    )
+
+
+@given(loan_scenarios())
+def test_monthly_loan_payment_repays_principal(scenarios):
+    principals, aprs, terms = scenarios
+    payments = monthly_loan_payment(principals, aprs, terms)
+    assert np.all(payments * terms >= principals * (1 - 1e-12))
+
+
+@given(st.floats(1e3, 1e6), apr_values, st.integers(1, 96))
+def test_remaining_balances_never_increase(principal, apr, term):
+    balances = remaining_balances(principal, apr, term, np.arange(term + 13))
+    assert balances[0] == pytest.approx(principal)
+    assert np.all(np.diff(balances) <= 1e-6 * principal)
+    assert np.all(balances >= 0)
+    assert balances[-1] == pytest.approx(0.0, abs=1e-6 * principal)
+
+
+@given(
+    hnp.arrays(np.float64, st.integers(1, 1024), elements=st.floats(1e3, 1e5)),
+    st.floats(0, 1),
+    st.floats(0, 0.005),
+    st.integers(1, 60),
+)
+def test_lease_payments_recover_depreciation(caps, residual_frac, mf, term):
+    # Over the full term, payments minus finance fees pay off exactly cap - residual
+    residuals = caps * residual_frac
+    payments = lease_payment_from_mf(caps, residuals, mf, term)
+    finance_fees = (caps + residuals) * mf * term
+    np.testing.assert_allclose(
+        payments * term - finance_fees, caps - residuals, rtol=1e-9, atol=1e-6
+    )
+
+
+@given(
+    hnp.arrays(np.float64, st.integers(1, 256), elements=st.integers(-100_000, 100_000).map(float)),
+    hnp.arrays(np.int64, st.integers(1, 256), elements=st.integers(-12, 60)),
+)
+def test_lease_payment_masks_invalid_entries(caps, terms):
+    size = min(caps.size, terms.size)
+    caps, terms = caps[:size], terms[:size]
+    payments = lease_payment_from_mf(caps, caps * 0.5, 0.001, terms)
+    invalid = (caps <= 0) | (terms <= 0)
+    assert np.all(payments[invalid] == 0.0)
+    assert np.all(payments[~invalid] > 0.0)